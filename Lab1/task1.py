@@ -1,8 +1,102 @@
 import doctest
-from typing import Union
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+
+class FieldRule(NamedTuple):
+    """ Правило проверки параметра конструктора, общее для __init__ и from_columns. """
+    types: tuple  # допустимые типы значения
+    is_valid: Callable[[Any], bool]  # проверка одного значения
+    column_is_valid: Callable[[list], bool]  # проверка всего столбца значений точных типов
+    type_message: str
+    value_message: str
+
+    def check(self, value: Any) -> None:
+        if not isinstance(value, self.types):
+            raise TypeError(self.type_message)
+        if not self.is_valid(value):
+            raise ValueError(self.value_message)
+
+
+def _positive_number(type_message: str, value_message: str) -> FieldRule:
+    return FieldRule((int, float), lambda value: value > 0, lambda column: min(column, default=1) > 0,
+                     type_message, value_message)
+
+
+def _non_negative_number(type_message: str, value_message: str) -> FieldRule:
+    return FieldRule((int, float), lambda value: value >= 0, lambda column: min(column, default=0) >= 0,
+                     type_message, value_message)
+
+
+def _non_empty_str(type_message: str, value_message: str) -> FieldRule:
+    return FieldRule((str,), lambda value: value != "", lambda column: "" not in column, type_message, value_message)
+
+
+def _describe_rows(errors: List[Tuple[int, Exception]]) -> str:
+    return "; ".join(f"строка {row}: {error}" for row, error in errors)
+
+
+def _build_many(cls, rules: Sequence[FieldRule], columns: Sequence[Sequence]) -> list:
+    """
+    Создание списка объектов класса по столбцам значений с проверкой столбцов целиком
+    :param cls: Класс создаваемых объектов, у которого есть from_trusted
+    :param rules: Правила проверки параметров конструктора по порядку
+    :param columns: Столбцы значений параметров конструктора в том же порядке
+
+    :raise ValueError: Если столбцы разной длины, то вызываем ошибку
+    :raise TypeError: Если в строках есть значения неверного типа, то вызываем ошибку со списком этих строк,
+    а строки с неверными значениями передаем в причине ошибки (__cause__)
+    :raise ValueError: Если в строках есть только неверные значения, то вызываем ошибку со списком этих строк
+    """
+    # массивы (array, numpy) превращаем в списки чисел Python
+    columns = [column.tolist() if hasattr(column, "tolist") else list(column) for column in columns]
+    if len({len(column) for column in columns}) > 1:
+        raise ValueError("Столбцы значений должны быть одинаковой длины")
+
+    # быстрая проверка: точные типы и допустимость всего столбца одной операцией
+    if not all(
+        set(map(type, column)) <= set(rule.types) and rule.column_is_valid(column)
+        for column, rule in zip(columns, rules)
+    ):
+        # медленная проверка по строкам, у каждой строки первая ошибка, как в конструкторе
+        errors = {}
+        for column, rule in zip(columns, rules):
+            for row, value in enumerate(column):
+                if row in errors:
+                    continue
+                try:
+                    rule.check(value)
+                except (TypeError, ValueError) as error:
+                    errors[row] = error
+        if errors:
+            rows = sorted(errors.items())
+            type_errors = [(row, error) for row, error in rows if isinstance(error, TypeError)]
+            value_errors = [(row, error) for row, error in rows if isinstance(error, ValueError)]
+            if not type_errors:
+                raise ValueError(_describe_rows(value_errors))
+            error = TypeError(_describe_rows(type_errors))
+            if value_errors:
+                raise error from ValueError(_describe_rows(value_errors))
+            raise error
+
+    return [cls.from_trusted(*values) for values in zip(*columns)]
+
+
+_WAND_RULES = {
+    "strength": _positive_number("Прочность палочки должна быть типа int или float",
+                                 "Прочность палочки должна быть больше нуля"),
+    "magic": _non_negative_number("Магия палочки должна быть типа int или float",
+                                  "Магия палочки должна быть положительным числом"),
+    "material": _non_empty_str("Материал палочки должен быть типа str",
+                               "Материал палочки не может быть пустым значением"),
+}
 
 
 class Wand:
+    __slots__ = ("strength", "magic", "material", "_history")
+
     def __init__(self, strength: Union[int, float], magic: Union[int, float], material: str):
         """
         Создание и подготовка к работе объекта "Палочка"
@@ -25,24 +119,67 @@ class Wand:
         ValueError: Магия палочки должна быть положительным числом
         """
 
-        if not isinstance(strength, (int, float)):
-            raise TypeError("Прочность палочки должна быть типа int или float")
-        if strength <= 0:
-            raise ValueError("Прочность палочки должна быть больше нуля")
+        _WAND_RULES["strength"].check(strength)
         self.strength = strength
+        # прочность после включения записи и после каждой следующей починки и поломки по порядку,
+        # None - история не записывается
+        self._history = None
 
-        if not isinstance(magic, (int, float)):
-            raise TypeError("Магия палочки должна быть типа int или float")
-        if magic < 0:
-            raise ValueError("Магия палочки должна быть положительным числом")
+        _WAND_RULES["magic"].check(magic)
         self.magic = magic
 
-        if not isinstance(material, str):
-            raise TypeError("Материал палочки должен быть типа str")
-        if material == "":
-            raise ValueError("Материал палочки не может быть пустым значением")
+        _WAND_RULES["material"].check(material)
         self.material = material
 
+    @classmethod
+    def from_columns(cls, strength: Sequence, magic: Sequence, material: Sequence) -> List["Wand"]:
+        """
+        Создание списка палочек по столбцам значений
+        :param strength: Столбец уровней прочности палочек
+        :param magic: Столбец уровней магии палочек
+        :param material: Столбец материалов палочек
+        :return: Список палочек (list)
+
+        :raise TypeError, ValueError: Если хотя бы одна строка некорректна, то вызываем ошибку со списком строк
+
+        Примеры:
+        >>> wands = Wand.from_columns([100, 50], [100, 0], ["yew", "oak"])
+        >>> len(wands)
+        2
+        >>> Wand.from_columns([100, -1, 5], [-1, 1, 1], ["yew", "oak", "ash"]) # ошибочное использование функции
+        Traceback (most recent call last):
+        ...
+        ValueError: строка 0: Магия палочки должна быть положительным числом; строка 1: Прочность палочки должна быть больше нуля
+        >>> Wand.from_columns([100, -1], [1, 1], [7, "oak"]) # ошибочное использование функции
+        Traceback (most recent call last):
+        ...
+        TypeError: строка 0: Материал палочки должен быть типа str
+        """
+
+        return _build_many(cls, list(_WAND_RULES.values()), [strength, magic, material])
+
+    @classmethod
+    def from_trusted(cls, strength: Union[int, float], magic: Union[int, float], material: str) -> "Wand":
+        """
+        Создание палочки без проверок параметров, только для заранее проверенных данных
+        :param strength: Уровень прочности палочки (int, float)
+        :param magic: Уровень магии палочки (int, float)
+        :param material: Материал палочки (str)
+        :return: Палочка (Wand)
+
+        Примеры:
+        >>> wand = Wand.from_trusted(100, 100, "yew")
+        >>> wand.can_spell()
+        True
+        """
+
+        wand = cls.__new__(cls)
+        wand.strength = strength
+        wand.magic = magic
+        wand.material = material
+        wand._history = None
+        return wand
+
     def can_spell(self) -> bool:
         """
         Функция, которая проверяет является ли палочка волшебной
@@ -85,6 +222,8 @@ class Wand:
         if add_strength <= 0:
             raise ValueError("Добавочная прочность палочки должна быть больше нуля")
         self.strength += add_strength
+        if self._history is not None:
+            self._history.append(self.strength)
 
     def crack(self, take_strength: Union[int, float]) -> None:
         """
@@ -118,9 +257,86 @@ class Wand:
         if take_strength > self.strength:
             raise ValueError("Отнимаемая прочность палочки должна быть меньше или равна нынешней прочности палочки")
         self.strength -= take_strength
+        if self._history is not None:
+            self._history.append(self.strength)
+
+    def track_history(self) -> None:
+        """
+        Функция для включения записи истории прочности палочки. По умолчанию история не записывается,
+        чтобы починки и поломки не накапливали память; повторный вызов ничего не меняет
+
+        Примеры:
+        >>> wand = Wand(100, 100, "yew")
+        >>> wand.crack(30)
+        >>> wand.track_history()
+        >>> wand.fix(10)
+        >>> wand.track_history()
+        >>> wand.strength_at(0), wand.strength_at(1)
+        (70, 80)
+        """
+
+        if self._history is None:
+            self._history = [self.strength]
+
+    def strength_at(self, step: int) -> Union[int, float]:
+        """
+        Функция для получения прочности палочки после заданного числа починок и поломок
+        :param step: Количество учитываемых изменений прочности, 0 - прочность при включении записи истории (int)
+        :return: Прочность палочки после step изменений (int, float)
+
+        :raise TypeError: Если номер изменения не соответсвует типу int, то вызываем ошибку
+        :raise ValueError: Если история не записывается, номер изменения отрицательный или больше числа изменений,
+        то вызываем ошибку
+
+        Примеры:
+        >>> wand = Wand(100, 100, "yew")
+        >>> wand.track_history()
+        >>> wand.crack(30)
+        >>> wand.fix(10)
+        >>> wand.strength_at(0), wand.strength_at(1), wand.strength_at(2)
+        (100, 70, 80)
+        >>> wand = Wand(0.1, 1, "yew")
+        >>> wand.track_history()
+        >>> wand.fix(0.2)
+        >>> wand.fix(0.3)
+        >>> wand.strength_at(2) == wand.strength
+        True
+        >>> wand.strength_at(3) # ошибочное использование функции
+        Traceback (most recent call last):
+        ...
+        ValueError: Номер изменения прочности должен быть от 0 до 2
+        >>> wand.strength_at(True) # ошибочное использование функции
+        Traceback (most recent call last):
+        ...
+        TypeError: Номер изменения прочности должен быть типа int
+        >>> Wand(100, 100, "yew").strength_at(0) # ошибочное использование функции
+        Traceback (most recent call last):
+        ...
+        ValueError: История прочности палочки не записывается, сначала вызовите track_history
+        """
+
+        if not isinstance(step, int) or isinstance(step, bool):
+            raise TypeError("Номер изменения прочности должен быть типа int")
+        if self._history is None:
+            raise ValueError("История прочности палочки не записывается, сначала вызовите track_history")
+        if not 0 <= step < len(self._history):
+            raise ValueError(f"Номер изменения прочности должен быть от 0 до {len(self._history) - 1}")
+        return self._history[step]
+
+
+_WITCH_RULES = {
+    "health": _positive_number("Здоровье ведьмы должна быть типа int или float",
+                               "Здоровье ведьмы должна быть больше нуля"),
+    "magic": _non_negative_number("Магия ведьмы должна быть типа int или float",
+                                  "Магия ведьмы должна быть положительным числом"),
+    "wand": FieldRule((Wand,), Wand.can_spell, lambda column: all(map(Wand.can_spell, column)),
+                      "Новая палочка должна принадлежать классу Wand", "Палочка ведьмы должна быть способна колдовать"),
+}
 
 
 class Witch:
+    __slots__ = ("health", "magic", "wand")
+
     def __init__(self, health: Union[int, float], magic: Union[int, float], wand: Wand):
         """
         Создание и подготовка к работе объекта "Ведьма"
@@ -149,24 +365,58 @@ class Witch:
         ValueError: Палочка ведьмы должна быть способна колдовать
         """
 
-        if not isinstance(health, (int, float)):
-            raise TypeError("Здоровье ведьмы должна быть типа int или float")
-        if health <= 0:
-            raise ValueError("Здоровье ведьмы должна быть больше нуля")
+        _WITCH_RULES["health"].check(health)
         self.health = health
 
-        if not isinstance(magic, (int, float)):
-            raise TypeError("Магия ведьмы должна быть типа int или float")
-        if magic < 0:
-            raise ValueError("Магия ведьмы должна быть положительным числом")
+        _WITCH_RULES["magic"].check(magic)
         self.magic = magic
 
-        if not isinstance(wand, Wand):
-            raise TypeError("Новая палочка должна принадлежать классу Wand")
-        if not wand.can_spell():
-            raise ValueError("Палочка ведьмы должна быть способна колдовать")
+        _WITCH_RULES["wand"].check(wand)
         self.wand = wand
 
+    @classmethod
+    def from_columns(cls, health: Sequence, magic: Sequence, wand: Sequence) -> List["Witch"]:
+        """
+        Создание списка ведьм по столбцам значений
+        :param health: Столбец уровней здоровья ведьм
+        :param magic: Столбец уровней магии ведьм
+        :param wand: Столбец волшебных палочек ведьм
+        :return: Список ведьм (list)
+
+        Примеры:
+        >>> wand_yew = Wand(100, 100, "yew")
+        >>> witches = Witch.from_columns([100, 50], [100, 10], [wand_yew, wand_yew])
+        >>> len(witches)
+        2
+        >>> Witch.from_columns([100, 50], ["100", 10], [wand_yew, "wand"]) # ошибочное использование функции
+        Traceback (most recent call last):
+        ...
+        TypeError: строка 0: Магия ведьмы должна быть типа int или float; строка 1: Новая палочка должна принадлежать классу Wand
+        """
+
+        return _build_many(cls, list(_WITCH_RULES.values()), [health, magic, wand])
+
+    @classmethod
+    def from_trusted(cls, health: Union[int, float], magic: Union[int, float], wand: Wand) -> "Witch":
+        """
+        Создание ведьмы без проверок параметров, только для заранее проверенных данных
+        :param health: Уровень здоровья ведьмы (int, float)
+        :param magic: Уровень магии ведьмы (int, float)
+        :param wand: Волшебная палочка ведьмы (Wand)
+        :return: Ведьма (Witch)
+
+        Примеры:
+        >>> witch = Witch.from_trusted(100, 100, Wand.from_trusted(100, 100, "yew"))
+        >>> witch.splash_of_magic()
+        10000
+        """
+
+        witch = cls.__new__(cls)
+        witch.health = health
+        witch.magic = magic
+        witch.wand = wand
+        return witch
+
     def change_wand(self, new_wand: Wand) -> None:
         """
         Функция для изменение палочки ведьмы
@@ -191,10 +441,7 @@ class Witch:
         TypeError: Новая палочка должна принадлежать классу Wand
         """
 
-        if not isinstance(new_wand, Wand):
-            raise TypeError("Новая палочка должна принадлежать классу Wand")
-        if not new_wand.can_spell():
-            raise ValueError("Палочка ведьмы должна быть способна колдовать")
+        _WITCH_RULES["wand"].check(new_wand)
         self.wand = new_wand
 
     def treatment(self, add_health: Union[int, float]) -> None:
@@ -239,7 +486,188 @@ class Witch:
         return self.magic*self.magic
 
 
+class Coven:
+    def __init__(self, witches: Sequence[Witch]):
+        """
+        Создание и подготовка к работе объекта "Ковен" - группы ведьм, хранимой по столбцам.
+        Лечение и поломка применяются ко всем ведьмам одинаково, поэтому хранятся как общие
+        накопленные величины и выполняются за O(1), а столбцы вычисляются при чтении.
+        Столбцы доступны только для чтения, чтобы они не расходились с посчитанным всплеском магии
+        :param witches: Ведьмы ковена (Witch)
+
+        :raise TypeError: Если хотя бы один элемент не относится к классу Witch, то вызываем ошибку
+
+        Примеры:
+        >>> wand_yew = Wand(100, 100, "yew")
+        >>> coven = Coven([Witch(100, 10, wand_yew), Witch(50, 2, wand_yew)])  # инициализация экземпляра класса
+        >>> len(coven)
+        2
+        >>> list(coven.magic)
+        [10.0, 2.0]
+        >>> coven.magic[0] = 0  # ошибочное использование: столбцы только для чтения
+        Traceback (most recent call last):
+        ...
+        TypeError: cannot modify read-only memory
+        >>> coven.health[0] = 0  # ошибочное использование: столбцы только для чтения
+        Traceback (most recent call last):
+        ...
+        TypeError: 'tuple' object does not support item assignment
+        >>> coven = Coven(["witch"])  # ошибочная инициализация экземпляра класса
+        Traceback (most recent call last):
+        ...
+        TypeError: Участницы ковена должны принадлежать классу Witch
+        """
+
+        if not all(isinstance(witch, Witch) for witch in witches):
+            raise TypeError("Участницы ковена должны принадлежать классу Witch")
+        self._base_health = array("d", (witch.health for witch in witches))
+        self._added_health = 0  # здоровье, добавленное всем ведьмам лечением
+        self._magic = array("d", (witch.magic for witch in witches))
+        self._base_wand_strength = array("d", (witch.wand.strength for witch in witches))
+        # прочность, отнятая у всех палочек; max(max(s - a, 0) - b, 0) == max(s - a - b, 0),
+        # поэтому последовательные поломки складываются
+        self._taken_strength = 0
+        self._wand_magic = array("d", (witch.wand.magic for witch in witches))
+        self._wand_material = tuple(witch.wand.material for witch in witches)
+        # магия ведьм и палочек снаружи не меняется, поэтому всплеск магии считаем один раз
+        self._splash = sum(magic * magic for magic, wand_magic in zip(self._magic, self._wand_magic) if wand_magic > 0)
+
+    def __len__(self) -> int:
+        return len(self._base_health)
+
+    @property
+    def health(self) -> Tuple[float, ...]:
+        return tuple(health + self._added_health for health in self._base_health)
+
+    @property
+    def magic(self) -> memoryview:
+        return memoryview(self._magic).toreadonly()
+
+    @property
+    def wand_strength(self) -> Tuple[float, ...]:
+        return tuple(max(strength - self._taken_strength, 0.0) for strength in self._base_wand_strength)
+
+    @property
+    def wand_magic(self) -> memoryview:
+        return memoryview(self._wand_magic).toreadonly()
+
+    @property
+    def wand_material(self) -> Tuple[str, ...]:
+        return self._wand_material
+
+    def treatment(self, add_health: Union[int, float]) -> None:
+        """
+        Функция для лечения всех ведьм ковена
+        :param add_health: Количество добавляемого каждой ведьме здоровья (int, float)
+
+        :raise TypeError: Если количество добавляемого здоровья не соответсвует типу int или float, то вызываем ошибку
+        :raise ValueError: Если количество добавляемого здоровья отрицательное число, то вызываем ошибку
+
+        Примеры:
+        >>> wand_yew = Wand(100, 100, "yew")
+        >>> coven = Coven([Witch(100, 10, wand_yew), Witch(50, 2, wand_yew)])
+        >>> coven.treatment(10)
+        >>> list(coven.health)
+        [110.0, 60.0]
+        >>> coven.treatment(-10) # ошибочное использование функции
+        Traceback (most recent call last):
+        ...
+        ValueError: Добавляемое здоровье должно должна быть больше нуля
+        """
+
+        if not isinstance(add_health, (int, float)):
+            raise TypeError("Добавляемое здоровье должно быть типа int или float")
+        if add_health <= 0:
+            raise ValueError("Добавляемое здоровье должно должна быть больше нуля")
+        self._added_health += add_health
+
+    def crack_wands(self, take_strength: Union[int, float]) -> None:
+        """
+        Функция для поломки палочек всех ведьм ковена, прочность не опускается ниже нуля
+        :param take_strength: Количество отнимаемой у каждой палочки прочности (int, float)
+
+        :raise TypeError: Если количество отнимаемой прочности не соответсвует типу int или float, то вызываем ошибку
+        :raise ValueError: Если количество отнимаемой прочности отрицательное, то вызываем ошибку
+
+        Примеры:
+        >>> coven = Coven([Witch(100, 10, Wand(100, 100, "yew")), Witch(50, 2, Wand(30, 5, "oak"))])
+        >>> coven.crack_wands(50)
+        >>> list(coven.wand_strength)
+        [50.0, 0.0]
+        """
+
+        if not isinstance(take_strength, (int, float)):
+            raise TypeError("Отнимаемая прочность палочки должна быть типа int или float")
+        if take_strength <= 0:
+            raise ValueError("Отнимаемая прочность палочки должна быть больше нуля")
+        self._taken_strength += take_strength
+
+    def splash_of_magic(self) -> float:
+        """
+        Функция для общего всплеска магии ведьм, чьи палочки способны колдовать
+        :return: Сумма квадратов магии ведьм (float)
+
+        Примеры:
+        >>> coven = Coven([Witch(100, 10, Wand(100, 100, "yew")), Witch(50, 2, Wand(30, 5, "oak"))])
+        >>> coven.splash_of_magic()
+        104.0
+        """
+
+        return self._splash
+
+    def witch(self, index: int) -> Witch:
+        """
+        Функция для получения ведьмы ковена в виде объекта. Каждый вызов создает новые независимые
+        объекты: история починок и поломок палочки не переносится, а палочка, общая для нескольких ведьм,
+        у каждой ведьмы будет своей копией. Палочка, сломанная до нуля, возвращается с нулевой прочностью,
+        как после Wand.crack на всю прочность; конструктор Wand такую палочку не принимает, поэтому
+        она создается через from_trusted
+        :param index: Номер ведьмы в ковене (int)
+        :return: Ведьма с палочкой (Witch)
+
+        Примеры:
+        >>> coven = Coven([Witch(100, 10, Wand(100, 100, "yew"))])
+        >>> witch = coven.witch(0)
+        >>> witch.health, witch.wand.material
+        (100.0, 'yew')
+        >>> coven.crack_wands(100)
+        >>> coven.witch(0).wand.strength
+        0.0
+        >>> wand = Wand(100, 100, "yew")
+        >>> wand.crack(100)  # то же состояние у отдельной палочки
+        >>> wand.strength
+        0
+        """
+
+        strength = max(self._base_wand_strength[index] - self._taken_strength, 0.0)
+        wand = Wand.from_trusted(strength, self._wand_magic[index], self._wand_material[index])
+        return Witch.from_trusted(self._base_health[index] + self._added_health, self._magic[index], wand)
+
+
+_MANTLE_RULES = {
+    "length": _positive_number("Длина мантии должна быть типа int или float",
+                               "Длина мантии должна быть больше нуля"),
+    "price": _non_negative_number("Цена мантии должна быть типа int или float",
+                                  "Цена мантии должна быть положительным числом"),
+    "material": _non_empty_str("Материал мантии должен быть типа str",
+                               "Материал мантии не может быть пустым значением"),
+}
+
+# коэффициент уменьшения цены при продаже или функция, вычисляющая его по материалу и длине мантии
+Decrease = Union[int, float, Callable[[str, Union[int, float]], Union[int, float]]]
+
+
+def _check_decrease(decrease: Any) -> None:
+    if isinstance(decrease, bool) or not isinstance(decrease, (int, float)):
+        raise TypeError("Коэффициент уменьшения цены должен быть типа int или float")
+    if decrease < 1:
+        raise ValueError("Коэффициент уменьшения цены должен быть не меньше единицы")
+
+
 class Mantle:
+    __slots__ = ("length", "price", "material")
+    DECREASE = 3  # пример значения для уменьшения цены во время продажи
+
     def __init__(self, length: Union[int, float], price: Union[int, float], material: str):
         """
         Создание и подготовка к работе объекта "Мантия"
@@ -263,24 +691,57 @@ class Mantle:
         ValueError: Материал мантии не может быть пустым значением
         """
 
-        if not isinstance(length, (int, float)):
-            raise TypeError("Длина мантии должна быть типа int или float")
-        if length <= 0:
-            raise ValueError("Длина мантии должна быть больше нуля")
+        _MANTLE_RULES["length"].check(length)
         self.length = length
 
-        if not isinstance(price, (int, float)):
-            raise TypeError("Цена мантии должна быть типа int или float")
-        if price < 0:
-            raise ValueError("Цена мантии должна быть положительным числом")
+        _MANTLE_RULES["price"].check(price)
         self.price = price
 
-        if not isinstance(material, str):
-            raise TypeError("Материал мантии должен быть типа str")
-        if material == "":
-            raise ValueError("Материал мантии не может быть пустым значением")
+        _MANTLE_RULES["material"].check(material)
         self.material = material
 
+    @classmethod
+    def from_columns(cls, length: Sequence, price: Sequence, material: Sequence) -> List["Mantle"]:
+        """
+        Создание списка мантий по столбцам значений
+        :param length: Столбец длин мантий
+        :param price: Столбец цен мантий
+        :param material: Столбец материалов мантий
+        :return: Список мантий (list)
+
+        Примеры:
+        >>> mantles = Mantle.from_columns([150, 120], [300, 100], ["silk", "wool"])
+        >>> len(mantles)
+        2
+        >>> Mantle.from_columns([150], [300, 100], ["silk"]) # ошибочное использование функции
+        Traceback (most recent call last):
+        ...
+        ValueError: Столбцы значений должны быть одинаковой длины
+        """
+
+        return _build_many(cls, list(_MANTLE_RULES.values()), [length, price, material])
+
+    @classmethod
+    def from_trusted(cls, length: Union[int, float], price: Union[int, float], material: str) -> "Mantle":
+        """
+        Создание мантии без проверок параметров, только для заранее проверенных данных
+        :param length: Длина мантии (int, float)
+        :param price: Цена мантии (int, float)
+        :param material: Материал мантии (str)
+        :return: Мантия (Mantle)
+
+        Примеры:
+        >>> mantle = Mantle.from_trusted(150, 300, "silk")
+        >>> mantle.sell()
+        200.0
+        """
+
+        mantle = cls.__new__(cls)
+        mantle.length = length
+        mantle.price = price
+        mantle.material = material
+        return mantle
+
     def buy(self, money: Union[int, float]) -> bool:
         """
         Функция для покупки мантии
@@ -301,21 +762,316 @@ class Mantle:
 
         return self.price <= money
 
-    def sell(self) -> float:
+    def sell(self, decrease: Optional[Decrease] = None) -> float:
         """
         Функция для продажи мантии и получении денег c вычетом процента от носки
+        :param decrease: Во сколько раз цена больше вычета за носку (int, float) или функция,
+        вычисляющая этот коэффициент по материалу и длине мантии (например, DepreciationSchedule),
+        по умолчанию Mantle.DECREASE
         :return: Количество полученных от продажи денег c вычетом процента от носки (float)
 
+        :raise TypeError: Если коэффициент уменьшения цены не соответсвует типу int или float, то вызываем ошибку
+        :raise ValueError: Если коэффициент уменьшения цены меньше единицы, то вызываем ошибку
+
         Примеры:
         >>> mantle = Mantle(150, 300, "silk")
         >>> mantle.sell()
         200.0
+        >>> mantle.sell(4)
+        225.0
+        >>> mantle.sell(lambda material, length: 4 if material == "silk" else 2)
+        225.0
+        >>> mantle.sell(0.5) # ошибочное использование функции
+        Traceback (most recent call last):
+        ...
+        ValueError: Коэффициент уменьшения цены должен быть не меньше единицы
+        >>> mantle.sell(True) # ошибочное использование функции
+        Traceback (most recent call last):
+        ...
+        TypeError: Коэффициент уменьшения цены должен быть типа int или float
         """
-        DECREASE = 3  # пример значения для уменьшения цены во время продажи
-        percent = self.price / DECREASE
+        if decrease is None:
+            decrease = type(self).DECREASE
+        if callable(decrease):
+            decrease = decrease(self.material, self.length)
+        _check_decrease(decrease)
+        percent = self.price / decrease
         return self.price - percent
 
 
+class DepreciationSchedule:
+    def __init__(self, steps: Dict[str, Sequence[Tuple[Union[int, float], Union[int, float]]]],
+                 default: Union[int, float] = Mantle.DECREASE):
+        """
+        Создание и подготовка к работе объекта "График уменьшения цены мантии при продаже"
+        :param steps: Для каждого материала список пар (длина, с которой действует ступень; коэффициент
+        уменьшения цены), ступени без учета порядка
+        :param default: Коэффициент для материалов и длин, для которых ступени нет (int, float)
+
+        :raise TypeError: Если длина начала ступени или коэффициент не соответсвуют типу int или float,
+        то вызываем ошибку
+        :raise ValueError: Если коэффициент меньше единицы, то вызываем ошибку
+
+        Примеры:
+        >>> schedule = DepreciationSchedule({"silk": [(0, 4), (200, 2)]})  # инициализация экземпляра класса
+        >>> Mantle(150, 300, "silk").sell(schedule)
+        225.0
+        >>> Mantle(250, 300, "silk").sell(schedule)
+        150.0
+        >>> Mantle(150, 300, "wool").sell(schedule)
+        200.0
+        >>> DepreciationSchedule({"silk": [(0, 0.5)]})  # ошибочная инициализация экземпляра класса
+        Traceback (most recent call last):
+        ...
+        ValueError: Коэффициент уменьшения цены должен быть не меньше единицы
+        >>> DepreciationSchedule({"silk": [("0", 4)]})  # ошибочная инициализация экземпляра класса
+        Traceback (most recent call last):
+        ...
+        TypeError: Длина начала ступени должна быть типа int или float
+        >>> DepreciationSchedule({}, default=True)  # ошибочная инициализация экземпляра класса
+        Traceback (most recent call last):
+        ...
+        TypeError: Коэффициент уменьшения цены должен быть типа int или float
+        """
+
+        _check_decrease(default)
+        for material_steps in steps.values():
+            for start, decrease in material_steps:
+                if isinstance(start, bool) or not isinstance(start, (int, float)):
+                    raise TypeError("Длина начала ступени должна быть типа int или float")
+                _check_decrease(decrease)
+        self.default = default
+        self._starts = {}  # материал -> отсортированные длины начала ступеней
+        self._decreases = {}  # материал -> коэффициенты ступеней в том же порядке
+        for material, material_steps in steps.items():
+            ordered = sorted(material_steps)
+            self._starts[material] = [start for start, _ in ordered]
+            self._decreases[material] = [decrease for _, decrease in ordered]
+
+    def __call__(self, material: str, length: Union[int, float]) -> Union[int, float]:
+        """
+        Функция для получения коэффициента уменьшения цены мантии, вызывается из Mantle.sell
+        :param material: Материал мантии (str)
+        :param length: Длина мантии (int, float)
+        :return: Коэффициент последней ступени материала, начало которой не больше длины, иначе default
+
+        Примеры:
+        >>> schedule = DepreciationSchedule({"silk": [(100, 4), (200, 2)]}, default=3)
+        >>> schedule("silk", 50), schedule("silk", 100), schedule("silk", 250), schedule("wool", 150)
+        (3, 4, 2, 3)
+        """
+
+        starts = self._starts.get(material)
+        if not starts:
+            return self.default
+        index = bisect_right(starts, length) - 1
+        if index < 0:
+            return self.default
+        return self._decreases[material][index]
+
+
+class MantleInventory:
+    def __init__(self, mantles: Sequence[Mantle] = ()):
+        """
+        Создание и подготовка к работе объекта "Склад мантий", мантии хранятся по возрастанию цены
+        (все вместе и отдельно для каждого материала). Цена мантии запоминается при добавлении,
+        поэтому менять цену мантии на складе нужно через reprice
+        :param mantles: Мантии на складе (Mantle)
+
+        Примеры:
+        >>> inventory = MantleInventory([Mantle(150, 300, "silk"), Mantle(120, 100, "wool")])  # инициализация
+        >>> len(inventory)
+        2
+        """
+
+        # None - все мантии, иначе материал -> (отсортированные цены, мантии в порядке цен)
+        self._sorted: Dict[Optional[str], Tuple[list, list]] = {None: ([], [])}
+        self._keys = {}  # id мантии -> (цена, материал), по которым она лежит в отсортированных списках
+        for mantle in mantles:
+            self.add(mantle)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _insert(self, material: Optional[str], price: Union[int, float], mantle: Mantle) -> None:
+        prices, mantles = self._sorted.setdefault(material, ([], []))
+        index = bisect_right(prices, price)
+        prices.insert(index, price)
+        mantles.insert(index, mantle)
+
+    def _delete(self, material: Optional[str], price: Union[int, float], mantle: Mantle) -> None:
+        prices, mantles = self._sorted[material]
+        for index in range(bisect_left(prices, price), bisect_right(prices, price)):
+            if mantles[index] is mantle:
+                del prices[index]
+                del mantles[index]
+                break
+        if material is not None and not mantles:
+            del self._sorted[material]
+
+    def add(self, mantle: Mantle) -> None:
+        """
+        Функция для добавления мантии на склад
+        :param mantle: Добавляемая мантия (Mantle)
+
+        :raise TypeError: Если мантия не относится к классу Mantle, то вызываем ошибку
+        :raise ValueError: Если мантия уже на складе, то вызываем ошибку
+
+        Примеры:
+        >>> inventory = MantleInventory()
+        >>> inventory.add(Mantle(150, 300, "silk"))
+        >>> inventory.add("mantle") # ошибочное использование функции
+        Traceback (most recent call last):
+        ...
+        TypeError: На склад можно добавить только объект класса Mantle
+        """
+
+        if not isinstance(mantle, Mantle):
+            raise TypeError("На склад можно добавить только объект класса Mantle")
+        if id(mantle) in self._keys:
+            raise ValueError("Мантия уже на складе")
+        self._keys[id(mantle)] = (mantle.price, mantle.material)
+        self._insert(None, mantle.price, mantle)
+        self._insert(mantle.material, mantle.price, mantle)
+
+    def remove(self, mantle: Mantle) -> None:
+        """
+        Функция для удаления мантии со склада
+        :param mantle: Удаляемая мантия (Mantle)
+
+        :raise ValueError: Если мантии нет на складе, то вызываем ошибку
+
+        Примеры:
+        >>> mantle = Mantle(150, 300, "silk")
+        >>> inventory = MantleInventory([mantle])
+        >>> inventory.remove(mantle)
+        >>> inventory.remove(mantle) # ошибочное использование функции
+        Traceback (most recent call last):
+        ...
+        ValueError: Мантии нет на складе
+        """
+
+        key = self._keys.pop(id(mantle), None)
+        if key is None:
+            raise ValueError("Мантии нет на складе")
+        price, material = key
+        self._delete(None, price, mantle)
+        self._delete(material, price, mantle)
+
+    def reprice(self, mantle: Mantle, price: Union[int, float]) -> None:
+        """
+        Функция для изменения цены мантии, лежащей на складе
+        :param mantle: Мантия на складе (Mantle)
+        :param price: Новая цена мантии (int, float)
+
+        :raise TypeError: Если цена не соответсвует типу int или float, то вызываем ошибку
+        :raise ValueError: Если цена отрицательная или мантии нет на складе, то вызываем ошибку
+
+        Примеры:
+        >>> mantle = Mantle(150, 300, "silk")
+        >>> inventory = MantleInventory([mantle, Mantle(120, 100, "wool")])
+        >>> inventory.reprice(mantle, 10)
+        >>> [mantle.material for mantle in inventory.affordable(20)]
+        ['silk']
+        """
+
+        _MANTLE_RULES["price"].check(price)
+        self.remove(mantle)
+        mantle.price = price
+        self.add(mantle)
+
+    def _select(self, material: Optional[str], low_price: Union[int, float], high_price: Union[int, float],
+                min_length: Optional[Union[int, float]], max_length: Optional[Union[int, float]]) -> Iterator[Mantle]:
+        # по цене и материалу мантии находятся двоичным поиском, длина проверяется внутри диапазона цен
+        prices, mantles = self._sorted.get(material, ([], []))
+        for index in range(bisect_left(prices, low_price), bisect_right(prices, high_price)):
+            mantle = mantles[index]
+            if min_length is not None and mantle.length < min_length:
+                continue
+            if max_length is not None and mantle.length > max_length:
+                continue
+            yield mantle
+
+    def price_range(self, low_price: Union[int, float], high_price: Union[int, float], material: Optional[str] = None,
+                    min_length: Optional[Union[int, float]] = None,
+                    max_length: Optional[Union[int, float]] = None) -> List[Mantle]:
+        """
+        Функция для поиска мантий с ценой в заданных границах
+        :param low_price: Нижняя граница цены включительно (int, float)
+        :param high_price: Верхняя граница цены включительно (int, float)
+        :param material: Материал мантии, если нужен отбор по материалу (str)
+        :param min_length: Наименьшая длина мантии (int, float)
+        :param max_length: Наибольшая длина мантии (int, float)
+        :return: Мантии по возрастанию цены (list)
+
+        Примеры:
+        >>> inventory = MantleInventory([Mantle(150, 300, "silk"), Mantle(120, 100, "wool"), Mantle(90, 200, "silk")])
+        >>> [mantle.price for mantle in inventory.price_range(100, 250)]
+        [100, 200]
+        >>> [mantle.price for mantle in inventory.price_range(0, 1000, material="silk", min_length=100)]
+        [300]
+        """
+
+        return list(self._select(material, low_price, high_price, min_length, max_length))
+
+    def affordable(self, money: Union[int, float], material: Optional[str] = None,
+                   min_length: Optional[Union[int, float]] = None,
+                   max_length: Optional[Union[int, float]] = None) -> List[Mantle]:
+        """
+        Функция для поиска мантий, которые можно купить за данные деньги (как Mantle.buy)
+        :param money: Количество предлагаемых для покупки денег (int, float)
+        :param material: Материал мантии, если нужен отбор по материалу (str)
+        :param min_length: Наименьшая длина мантии (int, float)
+        :param max_length: Наибольшая длина мантии (int, float)
+        :return: Мантии по возрастанию цены (list)
+
+        Примеры:
+        >>> inventory = MantleInventory([Mantle(150, 300, "silk"), Mantle(120, 100, "wool")])
+        >>> [mantle.material for mantle in inventory.affordable(300)]
+        ['wool', 'silk']
+        >>> inventory.affordable(50)
+        []
+        """
+
+        return list(self._select(material, float("-inf"), money, min_length, max_length))
+
+    def cheapest(self, count: int, material: Optional[str] = None,
+                 min_length: Optional[Union[int, float]] = None,
+                 max_length: Optional[Union[int, float]] = None) -> List[Mantle]:
+        """
+        Функция для поиска самых дешевых мантий
+        :param count: Количество мантий (int)
+        :param material: Материал мантии, если нужен отбор по материалу (str)
+        :param min_length: Наименьшая длина мантии (int, float)
+        :param max_length: Наибольшая длина мантии (int, float)
+        :return: Не более count мантий по возрастанию цены (list)
+
+        :raise TypeError: Если количество мантий не соответсвует типу int, то вызываем ошибку
+        :raise ValueError: Если количество мантий отрицательное, то вызываем ошибку
+
+        Примеры:
+        >>> inventory = MantleInventory([Mantle(150, 300, "silk"), Mantle(120, 100, "wool"), Mantle(90, 200, "silk")])
+        >>> [mantle.price for mantle in inventory.cheapest(2, material="silk")]
+        [200, 300]
+        >>> inventory.cheapest(0)
+        []
+        >>> inventory.cheapest(-1) # ошибочное использование функции
+        Traceback (most recent call last):
+        ...
+        ValueError: Количество мантий не может быть отрицательным
+        >>> inventory.cheapest(True) # ошибочное использование функции
+        Traceback (most recent call last):
+        ...
+        TypeError: Количество мантий должно быть типа int
+        """
+
+        if isinstance(count, bool) or not isinstance(count, int):
+            raise TypeError("Количество мантий должно быть типа int")
+        if count < 0:
+            raise ValueError("Количество мантий не может быть отрицательным")
+        return list(islice(self._select(material, float("-inf"), float("inf"), min_length, max_length), count))
+
+
 if __name__ == "__main__":
     doctest.testmod()
     pass
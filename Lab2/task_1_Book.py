@@ -13,6 +13,8 @@ BOOKS_DATABASE = [
 
 
 class Book:
+    __slots__ = ("id_", "name", "pages")  # без __dict__ у каждого экземпляра
+
     def __init__(self, id_: int, name: str, pages: int):
         self.id_ = id_  # идентификатор книги
         self.name = name  # название книги
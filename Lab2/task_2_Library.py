@@ -1,3 +1,21 @@
+import csv
+import doctest
+import heapq
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+SNAPSHOT_MAGIC = b"LIBR"  # сигнатура файла снимка библиотеки
+SNAPSHOT_VERSION = 2
+SNAPSHOT_HEADER = struct.Struct("<4sHQq")  # сигнатура, версия, количество книг, наибольший выданный id
+
 BOOKS_DATABASE = [
     {
         "id": 1,
@@ -13,6 +31,8 @@ BOOKS_DATABASE = [
 
 
 class Book:
+    __slots__ = ("id_", "name", "pages")  # без __dict__ у каждого экземпляра
+
     def __init__(self, id_: int, name: str, pages: int):
         self.id_ = id_  # идентификатор книги
         self.name = name  # название книги
@@ -26,32 +46,440 @@ class Book:
 
 
 
+def tokenize(text: str) -> List[str]:
+    # разбиваем текст на слова без учета регистра, в том числе для кириллицы
+    return re.findall(r"\w+", text.casefold())
+
+
+def _book_record(record: dict) -> dict:
+    # приводим запись из файла к виду BOOKS_DATABASE: id и pages - int, name - str
+    book_record = {}
+    for key, value_type in (("id", int), ("name", str), ("pages", int)):
+        value = record[key]
+        if value_type is int and isinstance(value, str):
+            value = int(value)
+        if isinstance(value, bool) or not isinstance(value, value_type):
+            raise TypeError(f"Поле {key} записи о книге должно быть типа {value_type.__name__}")
+        book_record[key] = value
+    return book_record
+
+
+def iter_records_jsonl(path: str) -> Iterator[dict]:
+    """
+    Чтение записей о книгах из файла JSON Lines построчно
+
+    Примеры:
+    >>> import os, tempfile
+    >>> with tempfile.TemporaryDirectory() as directory:
+    ...     path = os.path.join(directory, "books.jsonl")
+    ...     with open(path, "w", encoding="utf-8") as file:
+    ...         _ = file.write('{"id": 1, "name": "Война и мир", "pages": "1225"}\\n\\n')
+    ...         _ = file.write('{"id": 2, "name": "b", "pages": 7}\\n')
+    ...     list(iter_records_jsonl(path))
+    [{'id': 1, 'name': 'Война и мир', 'pages': 1225}, {'id': 2, 'name': 'b', 'pages': 7}]
+    """
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                yield _book_record(json.loads(line))
+
+
+def iter_records_csv(path: str) -> Iterator[dict]:
+    """
+    Чтение записей о книгах из CSV файла с заголовком id,name,pages построчно
+
+    Примеры:
+    >>> import os, tempfile
+    >>> with tempfile.TemporaryDirectory() as directory:
+    ...     path = os.path.join(directory, "books.csv")
+    ...     with open(path, "w", encoding="utf-8", newline="") as file:
+    ...         _ = file.write("id,name,pages\\n1,Война и мир,1225\\n2,b,7\\n")
+    ...     list(iter_records_csv(path))
+    [{'id': 1, 'name': 'Война и мир', 'pages': 1225}, {'id': 2, 'name': 'b', 'pages': 7}]
+    """
+    with open(path, encoding="utf-8", newline="") as file:
+        for row in csv.DictReader(file):
+            yield _book_record(row)
+
+
+def iter_books(records: Iterable[dict]) -> Iterator[Book]:
+    """
+    Создание книг по одной, не держа в памяти весь список записей
+
+    Примеры:
+    >>> library = Library()
+    >>> library.add_books(iter_books(BOOKS_DATABASE))
+    >>> library.books
+    [Book(id_=1, name='test_name_1', pages=200), Book(id_=2, name='test_name_2', pages=400)]
+    """
+    for book_dict in records:
+        yield Book(id_=book_dict["id"], name=book_dict["name"], pages=book_dict["pages"])
+
+
+class BookList(list):
+    """ Список книг библиотеки, который отмечает свои изменения, чтобы библиотека обновила индексы. """
+    changed = False
+
+
+def _marking_change(name: str):
+    method = getattr(list, name)
+
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self.changed = True
+        return result
+
+    wrapper.__name__ = name
+    return wrapper
+
+
+for _name in ("__setitem__", "__delitem__", "__iadd__", "__imul__",
+              "append", "extend", "insert", "pop", "remove", "clear", "sort", "reverse"):
+    setattr(BookList, _name, _marking_change(_name))
+
+
 class Library:
     def __init__(self, books=None):
         if books is None:
             books = []
+        self._index_by_id = {}  # индекс: id книги -> позиция в списке
+        self._max_book_id = 0  # наибольший выданный или занятый id
+        self._id_lock = threading.Lock()
+        self._ids_by_token: Dict[str, Set[int]] = {}  # индекс: слово названия -> id книг
+        # отсортированные слова названий для поиска по префиксу, None - индекс по названиям еще не построен
+        self._tokens: Optional[List[str]] = None
         self.books = books  # список книг
 
+    @property
+    def books(self) -> BookList:
+        return self._books
+
+    @books.setter
+    def books(self, books: Iterable[Book]) -> None:
+        # книги копируются в BookList, изменения которого библиотека замечает
+        self._books = BookList(books)
+        self.reindex()
+
+    def reindex(self) -> None:
+        # перестраиваем индексы, если список книг меняли напрямую;
+        # индекс по названиям строится при первом поиске
+        self._reindex_ids()
+        self._ids_by_token = {}
+        self._tokens = None
+
+    def _build_name_index(self) -> None:
+        self._ids_by_token = {}
+        for book in self.books:
+            for token in tokenize(book.name):
+                self._ids_by_token.setdefault(token, set()).add(book.id_)
+        self._tokens = sorted(self._ids_by_token)
+
+    def _reindex_ids(self) -> None:
+        # при повторяющихся id индекс указывает на первую книгу, как и поиск по списку
+        self._index_by_id = {}
+        for i, book in enumerate(self.books):
+            self._index_by_id.setdefault(book.id_, i)
+        self._books.changed = False
+        with self._id_lock:
+            self._max_book_id = max(self._max_book_id, max(self._index_by_id, default=0))
+
+    def _index_name(self, book: Book) -> None:
+        if self._tokens is None:
+            return
+        for token in tokenize(book.name):
+            if token not in self._ids_by_token:
+                self._ids_by_token[token] = set()
+                insort(self._tokens, token)
+            self._ids_by_token[token].add(book.id_)
+
+    def _unindex_name(self, book: Book) -> None:
+        if self._tokens is None:
+            return
+        for token in tokenize(book.name):
+            ids = self._ids_by_token.get(token)
+            if ids is None:
+                continue
+            ids.discard(book.id_)
+            if not ids:
+                del self._ids_by_token[token]
+                del self._tokens[bisect_left(self._tokens, token)]
+
+    def _reindex_if_stale(self) -> None:
+        # список книг меняли напрямую; после изменения атрибутов самих книг нужно вызвать reindex()
+        if self._books.changed:
+            self.reindex()
+
+    def add_book(self, book: Book) -> None:
+        self._reindex_if_stale()
+        if book.id_ in self._index_by_id:
+            raise ValueError("Книга с таким id уже есть в библиотеке")
+        self._index_by_id[book.id_] = len(self.books)
+        list.append(self._books, book)  # без отметки об изменении, индексы обновляются здесь же
+        self._index_name(book)
+        with self._id_lock:
+            self._max_book_id = max(self._max_book_id, book.id_)
+
+    def add_books(self, books: Iterable[Book]) -> None:
+        for book in books:
+            self.add_book(book)
+
+    def remove_book(self, id: int) -> Book:
+        index = self.get_index_by_book_id(id)
+        book = list.pop(self._books, index)
+        del self._index_by_id[id]
+        for i in range(index, len(self.books)):  # сдвигаем позиции книг после удаленной
+            book_id = self.books[i].id_
+            if self._index_by_id.get(book_id, i + 1) == i + 1:  # индекс указывает на первую книгу с таким id
+                self._index_by_id[book_id] = i
+        self._unindex_name(book)
+        return book
+
+    def save(self, path: str) -> None:
+        # сохраняем библиотеку в бинарный снимок: столбцы id и страниц,
+        # смещения названий и сами названия в UTF-8 подряд;
+        # снимок пишется во временный файл и заменяет старый только целиком
+        ids = array("q", (book.id_ for book in self.books))
+        pages = array("q", (book.pages for book in self.books))
+        names = [book.name.encode("utf-8") for book in self.books]
+        offsets = array("q", [0])
+        for name in names:
+            offsets.append(offsets[-1] + len(name))
+        columns = (ids, pages, offsets)
+        if sys.byteorder != "little":  # в файле всегда little-endian
+            for column in columns:
+                column.byteswap()
+        with self._id_lock:
+            max_book_id = self._max_book_id
+        temp_path = f"{path}.tmp"
+        try:
+            with open(temp_path, "wb") as file:
+                file.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(self.books), max_book_id))
+                for column in columns:
+                    column.tofile(file)
+                for name in names:
+                    file.write(name)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):  # недописанный снимок не оставляем
+                os.remove(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> "Library":
+        """
+        Загрузка библиотеки из снимка, сохраненного методом save. Файл отображается в память (mmap),
+        столбцы и названия читаются из него без промежуточных копий всего файла
+
+        Примеры:
+        >>> import os, tempfile
+        >>> directory = tempfile.TemporaryDirectory()
+        >>> path = os.path.join(directory.name, "library.bin")
+        >>> Library().save(path)
+        >>> Library.load(path).books
+        []
+        >>> library = Library([Book(id_=1, name="Война и мир", pages=1225), Book(id_=5, name="test_name_2", pages=400)])
+        >>> library.save(path)
+        >>> loaded = Library.load(path)
+        >>> loaded.books
+        [Book(id_=1, name='Война и мир', pages=1225), Book(id_=5, name='test_name_2', pages=400)]
+        >>> loaded.get_index_by_book_id(5)
+        1
+        >>> with open(path, "r+b") as file:  # обрезаем снимок, теряя названия книг
+        ...     _ = file.truncate(SNAPSHOT_HEADER.size + 3 * 8 * 2)
+        >>> Library.load(path)
+        Traceback (most recent call last):
+        ...
+        ValueError: Снимок библиотеки поврежден: файл короче, чем указано в заголовке
+        >>> with open(path, "wb") as file:
+        ...     _ = file.write(b"BOOK" + bytes(SNAPSHOT_HEADER.size))
+        >>> Library.load(path)
+        Traceback (most recent call last):
+        ...
+        ValueError: Файл не является снимком библиотеки
+        >>> sorted(os.listdir(directory.name))
+        ['library.bin']
+        >>> directory.cleanup()
+        """
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size < SNAPSHOT_HEADER.size:
+                raise ValueError("Снимок библиотеки поврежден: файл короче, чем указано в заголовке")
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                view = memoryview(data)
+                try:
+                    return cls._load_from_buffer(view)
+                finally:
+                    view.release()
+
+    @classmethod
+    def _load_from_buffer(cls, data: memoryview) -> "Library":
+        magic, version, count, max_book_id = SNAPSHOT_HEADER.unpack_from(data)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("Файл не является снимком библиотеки")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Неподдерживаемая версия снимка библиотеки: {version}")
+        if len(data) < SNAPSHOT_HEADER.size + (3 * count + 1) * 8:
+            raise ValueError("Снимок библиотеки поврежден: файл короче, чем указано в заголовке")
+
+        columns = []
+        position = SNAPSHOT_HEADER.size
+        for length in (count, count, count + 1):
+            column = array("q")
+            column.frombytes(data[position:position + length * column.itemsize])
+            if sys.byteorder != "little":
+                column.byteswap()
+            columns.append(column)
+            position += length * column.itemsize
+        ids, pages, offsets = columns
+
+        heap = data[position:]
+        if offsets[-1] > len(heap):
+            raise ValueError("Снимок библиотеки поврежден: файл короче, чем указано в заголовке")
+        offsets = offsets.tolist()
+        books = (
+            Book(id_=id_, name=str(heap[start:end], "utf-8"), pages=pages_count)
+            for id_, pages_count, start, end in zip(ids.tolist(), pages.tolist(), offsets, offsets[1:])
+        )
+        library = cls(books=books)
+        with library._id_lock:  # зарезервированные до сохранения id не выдаются повторно
+            library._max_book_id = max(library._max_book_id, max_book_id)
+        return library
+
     def get_next_book_id(self) -> int:
-        if not self.books:
-            return 1
-        return self.books[-1].id_+1
+        # следующий id после всех занятых и зарезервированных, сам id не резервируется
+        self._reindex_if_stale()
+        with self._id_lock:
+            return self._max_book_id + 1
+
+    def reserve_book_ids(self, count: int = 1) -> range:
+        """
+        Резервирование диапазона новых id, диапазоны разных вызовов (и потоков) не пересекаются
+
+        Примеры:
+        >>> library = Library([Book(id_=1, name="test_name_1", pages=200), Book(id_=2, name="test_name_2", pages=400)])
+        >>> library.reserve_book_ids(3)
+        range(3, 6)
+        >>> library.reserve_book_ids(2.5)
+        Traceback (most recent call last):
+        ...
+        TypeError: Количество резервируемых id должно быть типа int
+        >>> library.reserve_book_ids(0)
+        Traceback (most recent call last):
+        ...
+        ValueError: Количество резервируемых id должно быть больше нуля
+        >>> library.get_next_book_id()
+        6
+        """
+        if isinstance(count, bool) or not isinstance(count, int):
+            raise TypeError("Количество резервируемых id должно быть типа int")
+        if count <= 0:
+            raise ValueError("Количество резервируемых id должно быть больше нуля")
+        with self._id_lock:
+            start = self._max_book_id + 1
+            self._max_book_id += count
+        return range(start, start + count)
 
     def get_index_by_book_id(self, id: int) -> int:
-        for i, book in enumerate(self.books):
-            if book.id_ == id:
-                return i
-        raise ValueError("Книги с запрашиваемым id не существует")
+        """
+        Индекс книги с данным id в списке книг, в том числе после изменения списка напрямую
+
+        Примеры:
+        >>> library = Library([Book(id_=1, name="test_name_1", pages=200), Book(id_=2, name="test_name_2", pages=400)])
+        >>> library.get_index_by_book_id(2)
+        1
+        >>> library.books.append(Book(id_=3, name="test_name_3", pages=100))
+        >>> _ = library.books.pop(0)
+        >>> library.get_index_by_book_id(3)
+        1
+        >>> library.books[0] = Book(id_=7, name="test_name_7", pages=100)
+        >>> library.get_index_by_book_id(7)
+        0
+        >>> library.books = [Book(id_=8, name="test_name_8", pages=100), Book(id_=9, name="test_name_9", pages=100)]
+        >>> library.get_index_by_book_id(9)
+        1
+        >>> library.get_index_by_book_id(2)
+        Traceback (most recent call last):
+        ...
+        ValueError: Книги с запрашиваемым id не существует
+        """
+        self._reindex_if_stale()
+        index = self._index_by_id.get(id)
+        if index is not None and self.books[index].id_ != id:
+            self.reindex()  # порядок книг в списке меняли напрямую
+            index = self._index_by_id.get(id)
+        if index is None:
+            raise ValueError("Книги с запрашиваемым id не существует")
+        return index
+
+
+    def _ids_by_prefix(self, prefix: str) -> Set[int]:
+        ids = set()
+        for i in range(bisect_left(self._tokens, prefix), len(self._tokens)):
+            token = self._tokens[i]
+            if not token.startswith(prefix):
+                break
+            ids |= self._ids_by_token[token]
+        return ids
+
+    def find_books(self, query: str, limit: int = 10) -> List[Book]:
+        """
+        Поиск книг по словам названия без учета регистра, последнее слово запроса может быть началом слова;
+        выше в выдаче книги, совпавшие с большим числом слов запроса, при равенстве - с меньшим id
+
+        Примеры:
+        >>> library = Library([Book(id_=1, name="Война и мир", pages=1225), Book(id_=2, name="Мир приключений", pages=300),
+        ...                    Book(id_=3, name="Войны миров", pages=250)])
+        >>> library.find_books("МИР")
+        [Book(id_=1, name='Война и мир', pages=1225), Book(id_=2, name='Мир приключений', pages=300), Book(id_=3, name='Войны миров', pages=250)]
+        >>> library.find_books("война мир", limit=1)
+        [Book(id_=1, name='Война и мир', pages=1225)]
+        >>> library.find_books("вой")
+        [Book(id_=1, name='Война и мир', pages=1225), Book(id_=3, name='Войны миров', pages=250)]
+        >>> library.add_book(Book(id_=4, name="Ёжик в тумане", pages=30))
+        >>> library.find_books("ёЖИК")
+        [Book(id_=4, name='Ёжик в тумане', pages=30)]
+        >>> library.remove_book(1).name
+        'Война и мир'
+        >>> library.find_books("война")
+        []
+        >>> library.books[0] = Book(id_=7, name="x", pages=1)
+        >>> library.find_books("x")
+        [Book(id_=7, name='x', pages=1)]
+        >>> library.find_books("приключений")
+        []
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        self._reindex_if_stale()  # индекс по названиям сбрасывается вместе с индексом по id
+        if self._tokens is None:
+            self._build_name_index()
+        scores: Dict[int, int] = {}
+        for token in tokens[:-1]:
+            for book_id in self._ids_by_token.get(token, ()):
+                scores[book_id] = scores.get(book_id, 0) + 1
+        for book_id in self._ids_by_prefix(tokens[-1]):
+            scores[book_id] = scores.get(book_id, 0) + 1
+
+        best = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+        books = []
+        for book_id, _ in best:
+            try:
+                books.append(self.books[self.get_index_by_book_id(book_id)])
+            except ValueError:  # книгу заменили в списке на месте без reindex()
+                continue
+        return books
 
 
 if __name__ == '__main__':
+    doctest.testmod()  # тестирование примеров, которые находятся в документации
+
     empty_library = Library()  # инициализируем пустую библиотеку
     print(empty_library.get_next_book_id())  # проверяем следующий id для пустой библиотеки
 
-    list_books = [
-        Book(id_=book_dict["id"], name=book_dict["name"], pages=book_dict["pages"]) for book_dict in BOOKS_DATABASE
-    ]
-    library_with_books = Library(books=list_books)  # инициализируем библиотеку с книгами
+    library_with_books = Library()
+    library_with_books.add_books(iter_books(BOOKS_DATABASE))  # заполняем библиотеку книгами
     print(library_with_books.get_next_book_id())  # проверяем следующий id для непустой библиотеки
 
     print(library_with_books.get_index_by_book_id(1))  # проверяем индекс книги с id = 1
@@ -1,4 +1,7 @@
 import doctest
+import threading
+from array import array
+from typing import List, Sequence
 
 
 class Glass:
@@ -23,6 +26,29 @@ class Glass:
         if occupied_volume < 0:
             raise ValueError("Количество жидкости не может быть отрицательным числом")
         self.occupied_volume = occupied_volume
+        self._lock = threading.Lock()  # защищает occupied_volume при работе из нескольких потоков
+
+    def __getstate__(self) -> dict:
+        """
+        Состояние стакана для copy и pickle без блокировки, которую нельзя скопировать
+
+        Примеры:
+        >>> import copy, pickle
+        >>> glass = Glass(500, 200)
+        >>> copy.deepcopy(glass).occupied_volume
+        200
+        >>> restored = pickle.loads(pickle.dumps(glass))
+        >>> restored.add_water_to_glass(100)
+        >>> restored.occupied_volume, glass.occupied_volume
+        (300, 200)
+        """
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
 
     def is_empty_glass(self) -> bool:
         """
@@ -33,8 +59,9 @@ class Glass:
         Примеры:
         >>> glass = Glass(500, 0)
         >>> glass.is_empty_glass()
+        True
         """
-        ...
+        return self.occupied_volume == 0
 
     def add_water_to_glass(self, water: float) -> None:
         """
@@ -46,14 +73,21 @@ class Glass:
         Примеры:
         >>> glass = Glass(500, 0)
         >>> glass.add_water_to_glass(200)
+        >>> glass.add_water_to_glass(400)  # ошибочное использование функции
+        Traceback (most recent call last):
+        ...
+        ValueError: Добавляемая жидкость не помещается в стакан
         """
         if not isinstance(water, (int, float)):
             raise TypeError("Добавляемая жидкость должна быть типа int или float")
         if water < 0:
             raise ValueError("Добавляемая жидкость должна положительным числом")
-        ...
+        with self._lock:
+            if self.occupied_volume + water > self.capacity_volume:
+                raise ValueError("Добавляемая жидкость не помещается в стакан")
+            self.occupied_volume += water
 
-    def remove_water_from_glass(self, estimate_water: float) -> None:
+    def remove_water_from_glass(self, estimate_water: float) -> float:
         """
         Извлечение воды из стакана.
 
@@ -66,8 +100,165 @@ class Glass:
         Примеры:
         >>> glass = Glass(500, 500)
         >>> glass.remove_water_from_glass(200)
+        200
+        >>> glass.remove_water_from_glass(400)  # ошибочное использование функции
+        Traceback (most recent call last):
+        ...
+        ValueError: Извлекаемая жидкость превышает количество жидкости в стакане
+        """
+        if not isinstance(estimate_water, (int, float)):
+            raise TypeError("Извлекаемая жидкость должна быть типа int или float")
+        if estimate_water < 0:
+            raise ValueError("Извлекаемая жидкость должна положительным числом")
+        with self._lock:
+            if estimate_water > self.occupied_volume:
+                raise ValueError("Извлекаемая жидкость превышает количество жидкости в стакане")
+            self.occupied_volume -= estimate_water
+        return estimate_water
+
+    def transfer_water_to_glass(self, other: "Glass", water: float) -> None:
         """
+        Переливание воды в другой стакан одной операцией.
+
+        :param other: Стакан, в который переливается жидкость
+        :param water: Объем переливаемой жидкости
+
+        :raise ValueError: Если жидкости в стакане меньше, чем переливается, или она не помещается в другой стакан,
+        то вызываем ошибку и ни один стакан не меняется
+
+        Примеры:
+        >>> glass = Glass(500, 300)
+        >>> other_glass = Glass(200, 0)
+        >>> glass.transfer_water_to_glass(other_glass, 150)
+        >>> glass.occupied_volume, other_glass.occupied_volume
+        (150, 150)
+        >>> glass.transfer_water_to_glass(other_glass, 100)  # ошибочное использование функции
+        Traceback (most recent call last):
         ...
+        ValueError: Добавляемая жидкость не помещается в стакан
+
+        Переливания из нескольких потоков не теряют и не создают жидкость:
+        >>> import random
+        >>> glasses = [Glass(1000, 500) for _ in range(4)]
+        >>> def pour():
+        ...     for _ in range(2000):
+        ...         source, target = random.sample(glasses, 2)
+        ...         try:
+        ...             source.transfer_water_to_glass(target, 7)
+        ...         except ValueError:
+        ...             pass
+        >>> threads = [threading.Thread(target=pour) for _ in range(16)]
+        >>> for thread in threads:
+        ...     thread.start()
+        >>> for thread in threads:
+        ...     thread.join()
+        >>> sum(glass.occupied_volume for glass in glasses)
+        2000
+        """
+        if not isinstance(other, Glass):
+            raise TypeError("Переливать жидкость можно только в объект класса Glass")
+        if other is self:
+            raise ValueError("Нельзя переливать жидкость в тот же стакан")
+        if not isinstance(water, (int, float)):
+            raise TypeError("Переливаемая жидкость должна быть типа int или float")
+        if water < 0:
+            raise ValueError("Переливаемая жидкость должна положительным числом")
+        # блокируем стаканы всегда в одном порядке, чтобы встречные переливания не ждали друг друга вечно
+        first, second = sorted((self, other), key=id)
+        with first._lock, second._lock:
+            if water > self.occupied_volume:
+                raise ValueError("Извлекаемая жидкость превышает количество жидкости в стакане")
+            if other.occupied_volume + water > other.capacity_volume:
+                raise ValueError("Добавляемая жидкость не помещается в стакан")
+            self.occupied_volume -= water
+            other.occupied_volume += water
+
+
+class GlassArray:
+    def __init__(self, glasses: Sequence[Glass]):
+        """
+        Создание и подготовка к работе объекта "Набор стаканов", объемы хранятся по столбцам
+
+        :param glasses: Стаканы набора
+
+        Примеры:
+        >>> glasses = GlassArray([Glass(500, 0), Glass(200, 100)])  # инициализация экземпляра класса
+        >>> len(glasses)
+        2
+        """
+        if not all(isinstance(glass, Glass) for glass in glasses):
+            raise TypeError("Набор может состоять только из объектов класса Glass")
+        self.capacity_volume = array("d", (glass.capacity_volume for glass in glasses))
+        self.occupied_volume = array("d", (glass.occupied_volume for glass in glasses))
+
+    def __len__(self) -> int:
+        return len(self.capacity_volume)
+
+    def _check_volumes(self, volumes: Sequence[float]) -> List[float]:
+        # массивы (array, numpy) превращаем в списки чисел Python
+        volumes = volumes.tolist() if hasattr(volumes, "tolist") else list(volumes)
+        if len(volumes) != len(self):
+            raise ValueError("Количество объемов должно совпадать с количеством стаканов")
+        exact_types = set(map(type, volumes)) <= {int, float}  # быстрая проверка всего столбца
+        if not exact_types and not all(isinstance(volume, (int, float)) for volume in volumes):
+            raise TypeError("Объемы жидкости должны быть типа int или float")
+        if min(volumes, default=0) < 0:
+            raise ValueError("Объемы жидкости должны быть положительными числами")
+        return volumes
+
+    def add_water(self, volumes: Sequence[float]) -> List[float]:
+        """
+        Добавление воды в каждый стакан набора, лишняя жидкость не наливается.
+
+        :param volumes: Объем добавляемой жидкости для каждого стакана
+
+        :return: Объем не поместившейся жидкости для каждого стакана
+
+        Примеры:
+        >>> glasses = GlassArray([Glass(500, 0), Glass(200, 100)])
+        >>> glasses.add_water([200, 300])
+        [0.0, 200.0]
+        >>> list(glasses.occupied_volume)
+        [200.0, 200.0]
+        """
+        volumes = self._check_volumes(volumes)
+        occupied_volume = self.occupied_volume
+        capacity_volume = self.capacity_volume
+        overflow = [0.0] * len(volumes)
+        for i, volume in enumerate(volumes):  # один проход, столбец меняется на месте
+            total = occupied_volume[i] + volume
+            capacity = capacity_volume[i]
+            if total > capacity:
+                overflow[i] = total - capacity
+                total = capacity
+            occupied_volume[i] = total
+        return overflow
+
+    def remove_water(self, volumes: Sequence[float]) -> List[float]:
+        """
+        Извлечение воды из каждого стакана набора, но не больше, чем в нем есть.
+
+        :param volumes: Объем извлекаемой жидкости для каждого стакана
+
+        :return: Объем реально извлеченной жидкости для каждого стакана
+
+        Примеры:
+        >>> glasses = GlassArray([Glass(500, 500), Glass(200, 100)])
+        >>> glasses.remove_water([200, 300])
+        [200.0, 100.0]
+        >>> list(glasses.occupied_volume)
+        [300.0, 0.0]
+        """
+        volumes = self._check_volumes(volumes)
+        occupied_volume = self.occupied_volume
+        removed = [0.0] * len(volumes)
+        for i, volume in enumerate(volumes):  # один проход, столбец меняется на месте
+            occupied = occupied_volume[i]
+            if volume > occupied:
+                volume = occupied
+            removed[i] = float(volume)
+            occupied_volume[i] = occupied - volume
+        return removed
 
 
 if __name__ == "__main__":
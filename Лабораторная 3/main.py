@@ -1,31 +1,181 @@
+import doctest
+import sys
+from array import array
+from collections import defaultdict
+from typing import Dict, Iterable, Union
+
+
 class Book:
     """ Базовый класс книги. """
+    __slots__ = ("name", "author")
+    STR_TEMPLATE = "Книга {name}. Автор {author}"  # шаблоны используются и для вывода каталога
+    REPR_TEMPLATE = "{class_name}(name={name!r}, author={author!r})"
+
     def __init__(self, name: str, author: str):
         self.name = name
         self.author = author
 
     def __str__(self):
-        return f"Книга {self.name}. Автор {self.author}"
+        return self.STR_TEMPLATE.format(name=self.name, author=self.author)
 
     def __repr__(self):
-        return f"{self.__class__.__name__}(name={self.name!r}, author={self.author!r})"
+        # значения всех слотов по цепочке наследования, подклассам достаточно своего REPR_TEMPLATE
+        fields = {
+            slot: getattr(self, slot)
+            for cls in type(self).__mro__
+            for slot in getattr(cls, "__slots__", ())
+        }
+        return self.REPR_TEMPLATE.format(class_name=self.__class__.__name__, **fields)
+
 
+class PaperBook(Book):
+    """ Бумажная книга. """
+    __slots__ = ("pages",)
+    REPR_TEMPLATE = "{class_name}(name={name!r}, author={author!r}, pages={pages!r})"
 
-class PaperBook:
     def __init__(self, name: str, author: str, pages: int):
-        self.name = name
-        self.author = author
+        super().__init__(name, author)
         self.pages = pages
 
-    def __str__(self):
-        return f"Книга {self.name}. Автор {self.author}"
 
+class AudioBook(Book):
+    """ Аудио книга. """
+    __slots__ = ("duration",)
+    REPR_TEMPLATE = "{class_name}(name={name!r}, author={author!r}, duration={duration!r})"
 
-class AudioBook:
     def __init__(self, name: str, author: str, duration: float):
-        self.name = name
-        self.author = author
+        super().__init__(name, author)
         self.duration = duration
 
-    def __str__(self):
-        return f"Книга {self.name}. Автор {self.author}"
+
+class Catalogue:
+    """
+    Каталог бумажных и аудио книг, хранимый по столбцам.
+
+    Примеры:
+    >>> books = [PaperBook("Идиот", "Достоевский", 640), AudioBook("Бесы", "Достоевский", 25.5)]
+    >>> catalogue = Catalogue(books)
+    >>> len(catalogue)
+    2
+    >>> catalogue.render_str() == "\\n".join(map(str, books))
+    True
+    >>> catalogue.render_repr() == "\\n".join(map(repr, books))
+    True
+    >>> print(catalogue.render_repr())
+    PaperBook(name='Идиот', author='Достоевский', pages=640)
+    AudioBook(name='Бесы', author='Достоевский', duration=25.5)
+    """
+    PAPER = 0  # метка бумажной книги
+    AUDIO = 1  # метка аудио книги
+
+    def __init__(self, books: Iterable[Union[PaperBook, AudioBook]] = ()):
+        self.kinds = array("b")  # метка типа книги
+        self.names = []
+        self.authors = []  # авторы хранятся интернированными строками
+        self.pages = array("q")  # 0 для аудио книг
+        # 0 для бумажных книг; список, а не array("d"), чтобы целые длительности оставались int
+        self.durations = []
+        for book in books:
+            self.add(book)
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def add(self, book: Union[PaperBook, AudioBook]) -> None:
+        """
+        Добавление книги в конец каталога.
+
+        Примеры:
+        >>> catalogue = Catalogue()
+        >>> catalogue.add(PaperBook("Идиот", "Достоевский", 640))
+        >>> len(catalogue)
+        1
+        >>> catalogue.add(Book("Идиот", "Достоевский"))  # ошибочное использование функции
+        Traceback (most recent call last):
+        ...
+        TypeError: В каталог можно добавить только PaperBook или AudioBook
+        """
+        if isinstance(book, PaperBook):
+            self.kinds.append(self.PAPER)
+            self.pages.append(book.pages)
+            self.durations.append(0)
+        elif isinstance(book, AudioBook):
+            self.kinds.append(self.AUDIO)
+            self.pages.append(0)
+            self.durations.append(book.duration)
+        else:
+            raise TypeError("В каталог можно добавить только PaperBook или AudioBook")
+        self.names.append(book.name)
+        self.authors.append(sys.intern(book.author))
+
+    def book(self, index: int) -> Union[PaperBook, AudioBook]:
+        """
+        Книга каталога с номером index в виде нового объекта.
+
+        Примеры:
+        >>> catalogue = Catalogue([PaperBook("Идиот", "Достоевский", 640), AudioBook("Бесы", "Достоевский", 25)])
+        >>> catalogue.book(0)
+        PaperBook(name='Идиот', author='Достоевский', pages=640)
+        >>> catalogue.book(1)
+        AudioBook(name='Бесы', author='Достоевский', duration=25)
+        """
+        if self.kinds[index] == self.PAPER:
+            return PaperBook(self.names[index], self.authors[index], self.pages[index])
+        return AudioBook(self.names[index], self.authors[index], self.durations[index])
+
+    def render_str(self) -> str:
+        """ Строки __str__ всех книг каталога, по одной на строку. """
+        paper_str = PaperBook.STR_TEMPLATE.format
+        audio_str = AudioBook.STR_TEMPLATE.format
+        return "\n".join(
+            (paper_str if kind == self.PAPER else audio_str)(name=name, author=author)
+            for kind, name, author in zip(self.kinds, self.names, self.authors)
+        )
+
+    def render_repr(self) -> str:
+        """ Строки __repr__ всех книг каталога, по одной на строку. """
+        paper_repr = PaperBook.REPR_TEMPLATE.format
+        audio_repr = AudioBook.REPR_TEMPLATE.format
+        return "\n".join(
+            paper_repr(class_name=PaperBook.__name__, name=name, author=author, pages=pages) if kind == self.PAPER
+            else audio_repr(class_name=AudioBook.__name__, name=name, author=author, duration=duration)
+            for kind, name, author, pages, duration in zip(
+                self.kinds, self.names, self.authors, self.pages, self.durations
+            )
+        )
+
+    def total_pages_by_author(self) -> Dict[str, int]:
+        """
+        Сумма страниц бумажных книг каждого автора.
+
+        Примеры:
+        >>> catalogue = Catalogue([PaperBook("Идиот", "Достоевский", 640), PaperBook("Бесы", "Достоевский", 768),
+        ...                        AudioBook("Анна Каренина", "Толстой", 38.5)])
+        >>> catalogue.total_pages_by_author()
+        {'Достоевский': 1408}
+        """
+        totals = defaultdict(int)
+        for kind, author, pages in zip(self.kinds, self.authors, self.pages):
+            if kind == self.PAPER:
+                totals[author] += pages
+        return dict(totals)
+
+    def total_duration_by_author(self) -> Dict[str, float]:
+        """
+        Суммарная длительность аудио книг каждого автора.
+
+        Примеры:
+        >>> catalogue = Catalogue([AudioBook("Анна Каренина", "Толстой", 38.5), AudioBook("Война и мир", "Толстой", 61),
+        ...                        PaperBook("Идиот", "Достоевский", 640)])
+        >>> catalogue.total_duration_by_author()
+        {'Толстой': 99.5}
+        """
+        totals = defaultdict(int)
+        for kind, author, duration in zip(self.kinds, self.authors, self.durations):
+            if kind == self.AUDIO:
+                totals[author] += duration
+        return dict(totals)
+
+
+if __name__ == "__main__":
+    doctest.testmod()